@@ -1,4 +1,5 @@
 from excel_writer.excel_writer import ExcelWriter
-from excel_writer.excel import Line, Align, VAlign, Border, Format, Cell, Column, Table, Sheet
+from excel_writer.backend import XlsxWriterBackend, StreamBackend
+from excel_writer.excel import Line, Align, VAlign, Border, Format, Cell, Column, Table, Sheet, StringPool, SpillStore
 
-__all__ = ["ExcelWriter", "Line", "Align", "VAlign", "Border", "Format", "Cell", "Column", "Table", "Sheet"]
+__all__ = ["ExcelWriter", "XlsxWriterBackend", "StreamBackend", "Line", "Align", "VAlign", "Border", "Format", "Cell", "Column", "Table", "Sheet", "StringPool", "SpillStore"]
@@ -0,0 +1,85 @@
+from collections import namedtuple
+
+from xlsxwriter.format import Format
+from xlsxwriter.utility import xl_rowcol_to_cell_fast
+from xlsxwriter.worksheet import Worksheet
+
+from .excel import Cell
+
+StreamString = namedtuple("StreamString", ["string", "format"])
+
+
+class StreamWorksheet(Worksheet):
+    def __init__(self):
+        """Initialize a worksheet emitting its plain string cells from templates pre-rendered per format."""
+        super().__init__()
+        self.templates = dict()
+
+    def write_cell(self, row: int, col: int, string: str, cell_format: Format = None) -> int:
+        """Write a plain string to a cell without going through the type dispatch of `write`.
+
+        Strings xlsxwriter may turn into something else (blanks, formulas, urls, numbers) and
+        strings to be truncated are handed over to `write`.
+
+        Args:
+            row (int): The zero indexed row of the cell.
+            col (int): The zero indexed column of the cell.
+            string (str): The string to be written.
+            cell_format (Format): The xlsxwriter format of the cell.
+
+        Returns:
+            int: 0 on success, -1 if the cell is out of the worksheet bounds.
+        """
+        if (
+            not string or string[0] in "={" or ":" in string or len(string) > self.xls_strmax
+            or self.strings_to_numbers or self.constant_memory
+        ):
+            return self.write(row, col, string, cell_format)
+
+        if self._check_dimensions(row, col):
+            return -1
+
+        self.table[row][col] = StreamString(self.str_table._get_shared_string_index(string), cell_format)
+
+        return 0
+
+    def _write_cell(self, row: int, col: int, cell) -> None:
+        """Write the <c> element of a cell, from the template of its format for the cells of `write_cell`."""
+        if cell.__class__ is not StreamString:
+            return super()._write_cell(row, col, cell)
+
+        # A cell without format takes the format of its row, or else of its column, as in xlsxwriter.
+        cell_format = cell.format
+        if cell_format is None:
+            if row in self.set_rows and self.set_rows[row][1]:
+                cell_format = self.set_rows[row][1]
+            elif col in self.col_info:
+                cell_format = self.col_info[col][1]
+
+        template = self.templates.get(cell_format)
+        if template is None:
+            style = f' s="{cell_format._get_xf_index()}"' if cell_format else ""
+            template = self.templates[cell_format] = '<c r="%s"' + style + ' t="s"><v>%d</v></c>'
+
+        self.fh.write(template % (xl_rowcol_to_cell_fast(row, col), cell.string))
+
+
+class XlsxWriterBackend:
+    """The reference backend, writing the cells through the generic methods of xlsxwriter worksheets."""
+
+    worksheet_class = Worksheet
+
+    def write_cell(self, sheet: Worksheet, cell: Cell, cell_format: Format = None):
+        sheet.write(cell.x, cell.y, cell.data, cell_format)
+
+
+class StreamBackend(XlsxWriterBackend):
+    """A backend emitting the sheet XML of plain cells directly from templates pre-rendered per format.
+
+    Urls, rich strings, comments, merged ranges and native tables are still written by xlsxwriter.
+    """
+
+    worksheet_class = StreamWorksheet
+
+    def write_cell(self, sheet: StreamWorksheet, cell: Cell, cell_format: Format = None):
+        sheet.write_cell(cell.x, cell.y, cell.data, cell_format)
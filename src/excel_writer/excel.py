@@ -1,7 +1,15 @@
-from typing import Dict, List, Tuple, Union
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from array import array
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Union
+from collections.abc import Mapping
 from copy import deepcopy
 from texttable import Texttable
-from itertools import zip_longest
+from itertools import groupby, zip_longest
 from enum import Enum
 
 
@@ -22,6 +30,28 @@ def convert_coordinate(coordinate):
     return row_number, column_number
 
 
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_SHEET_NAME = 31
+
+
+def to_coordinate(coordinate: Union[str, Tuple]) -> Tuple[int, int]:
+    if isinstance(coordinate, str):
+        return convert_coordinate(coordinate)
+    elif isinstance(coordinate, tuple):
+        return tuple(map(int, coordinate))
+    else:
+        raise ValueError("The coordinate must be either 'A1' or (0, 0)")
+
+
+def check_sheet_column(column) -> None:
+    if column.table is None or column.table.sheet is None:
+        raise ValueError(f"The column '{column.name}' must belong to a table of a sheet to be charted.")
+
+
+def format_key(cell_format: Dict) -> tuple:
+    return tuple(sorted(cell_format.items()))
+
+
 class Line(Enum):
     NORMAL = 1
     THICK = 2
@@ -102,6 +132,26 @@ class Format(dict):
         return str(dict(self))
 
 
+class StringPool:
+    def __init__(self):
+        self.strings = dict()
+
+    def intern(self, data) -> str:
+        data = str(data)
+
+        return self.strings.setdefault(data, data)
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __iter__(self):
+        return iter(self.strings)
+
+    def __getstate__(self):
+        # The pool only serves the cells still to be added, a pickled sheet carries its own strings in its cells.
+        return {"strings": dict()}
+
+
 class Cell:
     def __init__(
         self,
@@ -136,6 +186,144 @@ class Cell:
         return self.data
 
 
+class SpillStore:
+    """A list of cells keeping at most `memory_budget` cells in memory.
+
+    Once the budget is exceeded, the older half of the cells in memory is pickled to a temp file,
+    which is memory-mapped to read them back. A spilled cell is a copy: changing a cell object after
+    it was spilled is lost unless the cell is assigned back, e.g. `store[i] = cell`.
+    Once closed, the store keeps its length but its spilled cells can no longer be read.
+
+    A pickled store refers to the temp file of the original one instead of carrying its cells. The copy
+    reads the file, and copies it before spilling cells of its own. The original removes it when closed.
+    """
+
+    def __init__(self, memory_budget: int = 100000, tmpdir: str = None):
+        if memory_budget < 2:
+            raise ValueError("Invalid memory_budget value. Must be at least 2 cells.")
+
+        self.memory_budget = memory_budget
+        self.tmpdir = tmpdir
+        self.file = None
+        self.path = None
+        self.remove_file = None
+        self.map = None
+        self.offsets = array("q")
+        self.sizes = array("q")
+        self.end = 0
+        self.tail = []
+
+    def __open(self):
+        fd, self.path = tempfile.mkstemp(suffix=".spill", dir=self.tmpdir)
+        self.file = os.fdopen(fd, "w+b")
+        self.remove_file = weakref.finalize(self, os.remove, self.path)
+
+    def __spill(self):
+        if self.file is None:
+            self.__open()
+
+        n = len(self.tail) // 2
+        for cell in self.tail[:n]:
+            self.offsets.append(self.end)
+            self.sizes.append(self.__write(pickle.dumps(cell, pickle.HIGHEST_PROTOCOL)))
+        del self.tail[:n]
+
+    def __write(self, data: bytes) -> int:
+        if self.remove_file is None:
+            # A pickled copy shares the file of the original store, it writes to a copy of it.
+            source = self.file
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            self.__open()
+            source.seek(0)
+            shutil.copyfileobj(source, self.file)
+            source.close()
+        self.file.seek(self.end)
+        self.file.write(data)
+        self.end += len(data)
+
+        return len(data)
+
+    def __read(self, i: int) -> Cell:
+        if self.file is None:
+            raise ValueError("The spilled cells of a closed SpillStore can not be read.")
+        if self.map is None or len(self.map) < self.end:
+            if self.map is not None:
+                self.map.close()
+            self.file.flush()
+            self.map = mmap.mmap(self.file.fileno(), self.end, access=mmap.ACCESS_READ)
+        offset = self.offsets[i]
+
+        return pickle.loads(self.map[offset:offset + self.sizes[i]])
+
+    def __index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("SpillStore index out of range")
+
+        return i
+
+    def append(self, cell: Cell):
+        self.tail.append(cell)
+        if len(self.tail) > self.memory_budget:
+            self.__spill()
+
+    def __len__(self):
+        return len(self.offsets) + len(self.tail)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        i = self.__index(i)
+        if i >= len(self.offsets):
+            return self.tail[i - len(self.offsets)]
+
+        return self.__read(i)
+
+    def __setitem__(self, i: int, cell: Cell):
+        i = self.__index(i)
+        if i >= len(self.offsets):
+            self.tail[i - len(self.offsets)] = cell
+        else:
+            self.offsets[i] = self.end
+            self.sizes[i] = self.__write(pickle.dumps(cell, pickle.HIGHEST_PROTOCOL))
+
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self.__read(i)
+        yield from self.tail
+
+    def __getstate__(self):
+        if self.file is not None:
+            self.file.flush()
+
+        return {
+            "memory_budget": self.memory_budget, "tmpdir": self.tmpdir,
+            "path": self.path if self.file is not None else None,
+            "offsets": self.offsets, "sizes": self.sizes, "end": self.end, "tail": self.tail,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["memory_budget"], state["tmpdir"])
+        self.offsets, self.sizes, self.end, self.tail = state["offsets"], state["sizes"], state["end"], state["tail"]
+        if state["path"]:
+            self.path = state["path"]
+            self.file = open(self.path, "rb")
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        if self.file is not None:
+            self.file.close()
+        if self.remove_file is not None:
+            self.remove_file()
+        self.map, self.file, self.remove_file = None, None, None
+
+
 class Column:
     def __init__(
         self,
@@ -145,6 +333,9 @@ class Column:
         y: int,
         column_format: Dict = None,
         cells: List[Cell] = None,
+        string_pool: StringPool = None,
+        total_function: str = None,
+        intern_strings: bool = False,
     ):
         self.name = name
         self.width = width
@@ -152,7 +343,13 @@ class Column:
         self.y = y
         self.n = 0
         self.column_format = Format(column_format if column_format else dict())
-        self.cells = cells if cells else []
+        self.cells = cells if cells is not None else []
+        self.string_pool = string_pool if string_pool is not None else StringPool()
+        self.total_function = total_function
+        # Share the string objects of repeated values, unless the cells are spilled: the pool would keep them all.
+        self.intern_strings = intern_strings and not isinstance(self.cells, SpillStore)
+        self.numeric = bool(total_function)  # a totals row only adds up numbers
+        self.table = None
 
     def get_and_add_cell(
         self,
@@ -164,7 +361,7 @@ class Column:
         url=None,
     ):
         cell = Cell(
-            data,
+            self.string_pool.intern(data) if self.intern_strings else data,
             self.x + self.n,
             self.y,
             data_format,
@@ -191,7 +388,9 @@ class Column:
         if not isinstance(lvl, Line):
             raise ValueError("Invalid lvl value. Must be an instance of Level Divisor.")
 
-        self.cells[row_num].draw_division(lvl)
+        cell = self.cells[row_num]
+        cell.draw_division(lvl)
+        self.cells[row_num] = cell  # write the cell back in case it was spilled to disk
 
 
 class Table:
@@ -202,21 +401,43 @@ class Table:
         table_format: Dict = None,
         filter_option: bool = False,
         columns: Dict[str, Column] = None,
+        string_pool: StringPool = None,
+        table_style: str = None,
+        memory_budget: int = None,
+        tmpdir: str = None,
+        max_rows: int = None,
     ):
         self.name = name
         self.x, self.y = draw_from
         self.table_format = Format(table_format if table_format else dict())
         self.filter_option = filter_option
+        self.table_style = table_style
+        self.memory_budget = memory_budget
+        self.tmpdir = tmpdir
+        self.max_rows = max_rows
         self.columns = columns if columns else dict()
+        self.string_pool = string_pool if string_pool is not None else StringPool()
         self.n = 0
-
-    def get_and_add_column(self, name, width: float = 5.0, column_format: Dict = None) -> Column:
+        self.shard_range = None
+        self.charts = list()
+        self.sparklines = list()
+        self.sheet = None
+        self.sharded = False
+
+    def get_and_add_column(
+        self, name, width: float = 5.0, column_format: Dict = None, total_function: str = None,
+        intern_strings: bool = False,
+    ) -> Column:
         col = Column(
             name,
             width,
             self.x,
             self.y + self.n,
             self.table_format.update(column_format if column_format else dict()),
+            cells=SpillStore(self.memory_budget, self.tmpdir) if self.memory_budget else None,
+            string_pool=self.string_pool,
+            total_function=total_function,
+            intern_strings=intern_strings,
         )
         self.add_column(col)
 
@@ -229,6 +450,7 @@ class Table:
     def add_column(self, col: Column):
         self.n += 1
         self.columns[col.name] = col
+        col.table = self
 
     def add_columns(self, cols: List[Column]):
         for col in cols:
@@ -241,6 +463,197 @@ class Table:
         for column in self.columns.values():
             column.draw_division(lvl, row_num)
 
+    def add_grouped(
+        self,
+        rows: Iterable[Union[Mapping, Sequence]],
+        group_by: Union[str, List[str]],
+        merge_columns: List[str] = None,
+        aggregates: Dict[str, Callable[[List[Dict]], object]] = None,
+        divider: Line = Line.NORMAL,
+    ) -> int:
+        """Add rows sorted by their group keys, merging columns across each group and dividing the groups.
+
+        Args:
+            rows (Iterable[Union[Mapping, Sequence]]): Rows as dicts keyed by column name, or as sequences
+                in the order of the columns not computed by `aggregates`. Rows of a group must be consecutive.
+            group_by (Union[str, List[str]]): The name(s) of the column(s) the rows are grouped by.
+            merge_columns (List[str]): The names of the columns to be merged across each group.
+            aggregates (Dict[str, Callable]): Functions computing the value of a column from the rows of a group,
+                e.g. {"Average": lambda rows: sum(row["Score"] for row in rows) / len(rows)}.
+            divider (Line): The line drawn below each group, None for no line.
+
+        Returns:
+            int: The number of groups added.
+        """
+        if divider is not None and not isinstance(divider, Line):
+            raise ValueError("Invalid divider value. Must be an instance of Line.")
+
+        keys = [group_by] if isinstance(group_by, str) else list(group_by)
+        merge_columns = set(merge_columns if merge_columns else [])
+        aggregates = aggregates if aggregates else dict()
+        for name in list(merge_columns) + list(aggregates):
+            if name not in self.columns:
+                raise ValueError(f"The column '{name}' is not in the table '{self.name}'.")
+        names = [name for name in self.columns if name not in aggregates]
+        divider_format = {"bottom": divider.value} if divider else None
+        rows = (row if isinstance(row, Mapping) else dict(zip(names, row)) for row in rows)
+
+        n_groups = 0
+        for _, group in groupby(rows, key=lambda row: tuple(row[key] for key in keys)):
+            group = list(group)
+            values = {name: aggregate(group) for name, aggregate in aggregates.items()}
+            for column in self.columns.values():
+                first_x, last_x = column.x + column.n, column.x + column.n + len(group) - 1
+                merge_range = None
+                if column.name in merge_columns and len(group) > 1:
+                    merge_range = ((first_x, column.y), (last_x, column.y))
+                for i, row in enumerate(group):
+                    column.get_and_add_cell(
+                        values[column.name] if column.name in values else row.get(column.name, ""),
+                        cell_format=divider_format if i == len(group) - 1 else None,
+                        merge_range=merge_range,
+                    )
+            n_groups += 1
+
+        return n_groups
+
+    def add_chart(
+        self,
+        chart_type: str,
+        values: List[str],
+        coordinate: Union[str, Tuple],
+        categories: str = None,
+        options: Dict = None,
+    ):
+        """Add a native Excel chart plotting the data rows of columns of the table.
+
+        Args:
+            chart_type (str): The xlsxwriter chart type, e.g. "line", "column" or "pie".
+            values (List[str]): The names of the columns plotted as series, named after their header cell.
+            coordinate (Union[str, Tuple]): The cell the chart is inserted at, either 'A1' or (0, 0).
+            categories (str): The name of the column holding the categories of the series.
+            options (Dict): The xlsxwriter chart options, e.g. {"title": {"name": "Scores"}, "x_scale": 1.5}.
+        """
+        for name in values + ([categories] if categories else []):
+            if name not in self.columns:
+                raise ValueError(f"The column '{name}' is not in the table '{self.name}'.")
+        for name in values:
+            self.columns[name].numeric = True
+
+        self.charts.append({
+            "type": chart_type,
+            "values": values,
+            "categories": categories,
+            "coordinate": to_coordinate(coordinate),
+            "options": options if options else dict(),
+        })
+
+    def add_sparklines(self, target: str, columns: List[str], options: Dict = None):
+        """Add a sparkline to every data row of the table, drawn in the target column from the row's values.
+
+        Args:
+            target (str): The name of the column the sparklines are drawn in.
+            columns (List[str]): The names of the columns the sparklines span, from the first to the last of them.
+            options (Dict): The xlsxwriter sparkline options, e.g. {"type": "column", "markers": True}.
+        """
+        if not columns:
+            raise ValueError("The sparklines must span at least one column.")
+        for name in [target] + columns:
+            if name not in self.columns:
+                raise ValueError(f"The column '{name}' is not in the table '{self.name}'.")
+        ys = [self.columns[name].y for name in columns]
+        for column in self.columns.values():
+            if min(ys) <= column.y <= max(ys):
+                column.numeric = True
+
+        self.sparklines.append({"target": target, "columns": columns, "options": options if options else dict()})
+
+    def close(self):
+        """Release the temp files of the columns spilling their cells, once the table is written."""
+        for column in self.columns.values():
+            if isinstance(column.cells, SpillStore):
+                column.cells.close()
+
+    def get_n_rows(self) -> int:
+        """Return the number of data rows of the table, the header row excluded."""
+        return max([len(column.cells) for column in self.columns.values()], default=1) - 1
+
+    def get_max_rows(self) -> int:
+        """Return the number of data rows a shard of the table can hold."""
+        total_row = any(column.total_function for column in self.columns.values())
+        limit = EXCEL_MAX_ROWS - self.x - 1 - total_row
+
+        return min(self.max_rows, limit) if self.max_rows else limit
+
+    def shard(self) -> List["Table"]:
+        """Split the table into tables of at most `get_max_rows()` data rows, each repeating the header cells.
+
+        Every shard is drawn from the same coordinate. The cells are moved to the shards, leaving the columns
+        of the table empty, and their merge ranges are clipped to the shard they fall in. A table can thus
+        be split only once, e.g. its sheet can not be written again.
+
+        Returns:
+            List[Table]: The shards of the table, or the table itself if it fits in one.
+        """
+        if self.sharded:
+            raise ValueError(f"The table '{self.name}' was already split across sheets, its cells were moved.")
+
+        n_rows, max_rows = self.get_n_rows(), self.get_max_rows()
+        if n_rows <= max_rows:
+            return [self]
+
+        self.sharded = True
+        shards = []
+        for k in range(0, (n_rows + max_rows - 1) // max_rows):
+            shard = Table(
+                self.name if k == 0 else f"{self.name}_{k + 1}", (self.x, self.y), self.table_format,
+                self.filter_option, string_pool=self.string_pool, table_style=self.table_style,
+                memory_budget=self.memory_budget, tmpdir=self.tmpdir, max_rows=self.max_rows,
+            )
+            shard.charts, shard.sparklines = self.charts, self.sparklines
+            shard.shard_range = (k * max_rows, min((k + 1) * max_rows, n_rows))
+            for column in self.columns.values():
+                shard_column = Column(
+                    column.name, column.width, column.x, column.y, column.column_format,
+                    cells=SpillStore(self.memory_budget, self.tmpdir) if self.memory_budget else None,
+                    string_pool=self.string_pool, total_function=column.total_function,
+                    intern_strings=column.intern_strings,
+                )
+                shard_column.numeric = column.numeric
+                shard.add_column(shard_column)
+            shards.append(shard)
+
+        for column in self.columns.values():
+            cells = iter(column.cells)
+            header = next(cells, None)
+            for shard in shards:
+                if header:
+                    shard.columns[column.name].add_cell(header)
+            for i, cell in enumerate(cells):
+                k, row = divmod(i, max_rows)
+                cell.x = self.x + 1 + row
+                cell.merge_range = self.__shard_merge_range(cell.merge_range, k, max_rows)
+                shards[k].columns[column.name].add_cell(cell)
+
+            if isinstance(column.cells, SpillStore):
+                column.cells.close()
+            column.cells, column.n = [], 0
+
+        return shards
+
+    def __shard_merge_range(self, merge_range: Tuple, k: int, max_rows: int):
+        if not merge_range:
+            return merge_range
+
+        def shard_row(row):
+            if row <= self.x:
+                return row
+            return min(max(row - k * max_rows, self.x + 1), self.x + max_rows)
+
+        (min_x, min_y), (max_x, max_y) = merge_range
+
+        return (shard_row(min_x), min_y), (shard_row(max_x), max_y)
+
     def show(self):
         t = Texttable()
         col_size = list()
@@ -268,7 +681,8 @@ class Table:
 class Sheet:
     def __init__(self, name, set_zoom: int = 100, freeze_panes: List[Tuple] = None, set_rows: List[Tuple] = None,
                  set_columns: List[Tuple] = None, sheet_format: Dict = None, tables: Dict[str, Table] = None,
-                 images: Dict = None, cells: List = None):
+                 images: Dict = None, cells: List = None, string_pool: StringPool = None,
+                 charts: List = None, sparklines: List = None):
         self.name = name
         self.set_zoom = set_zoom
         self.freeze_panes = freeze_panes
@@ -278,13 +692,63 @@ class Sheet:
         self.tables = tables if tables else dict()
         self.images = images if images else dict()
         self.cells = cells if cells else list()
-
-    def get_and_add_table(self, table_name, draw_from="A1", table_format: dict = None, filter_option: bool = False) -> Table:
+        self.string_pool = string_pool if string_pool is not None else StringPool()
+        self.charts = charts if charts else list()
+        self.sparklines = sparklines if sparklines else list()
+
+    def shard(self, sheet_names: Iterable[str] = ()) -> List["Sheet"]:
+        """Split the sheet into continuation sheets when its tables have more rows than they can hold.
+
+        The k-th continuation sheet holds the k-th shard of every table and repeats the sheet settings.
+        Images and cells inserted into the sheet are kept on the first sheet only. The continuation
+        sheets are named after the sheet, e.g. "Data (2)", skipping the names already taken.
+
+        Args:
+            sheet_names (Iterable[str]): The names of the other sheets of the workbook.
+
+        Returns:
+            List[Sheet]: The sheet followed by its continuation sheets.
+        """
+        table_shards = [table.shard() for table in self.tables.values()]
+        n_sheets = max([len(shards) for shards in table_shards], default=1)
+        if n_sheets == 1:
+            return [self]
+
+        names, taken = [self.name], {name.lower() for name in sheet_names}
+        k = 1
+        while len(names) < n_sheets:
+            k += 1
+            suffix = f" ({k})"
+            name = self.name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+            if name.lower() not in taken:
+                names.append(name)
+
+        sheets = []
+        for k, name in enumerate(names):
+            sheet = Sheet(
+                name, self.set_zoom, self.freeze_panes, self.set_rows, self.set_columns, self.sheet_format,
+                images=self.images if k == 0 else None,
+                cells=self.cells if k == 0 else None, string_pool=self.string_pool,
+                charts=self.charts if k == 0 else None,
+                sparklines=self.sparklines if k == 0 else None,
+            )
+            for shards in table_shards:
+                if k < len(shards):
+                    sheet.add_table(shards[k])
+            sheets.append(sheet)
+
+        return sheets
+
+    def get_and_add_table(self, table_name, draw_from="A1", table_format: dict = None, filter_option: bool = False,
+                          table_style: str = None, memory_budget: int = None, tmpdir: str = None,
+                          max_rows: int = None) -> Table:
         if isinstance(draw_from, str):
             draw_from = convert_coordinate(draw_from)
 
         table = Table(
-            table_name, draw_from, self.sheet_format.update(table_format if table_format else dict()), filter_option
+            table_name, draw_from, self.sheet_format.update(table_format if table_format else dict()), filter_option,
+            string_pool=self.string_pool, table_style=table_style, memory_budget=memory_budget, tmpdir=tmpdir,
+            max_rows=max_rows,
         )
         self.add_table(table)
 
@@ -296,6 +760,7 @@ class Sheet:
 
     def add_table(self, table: Table) -> None:
         self.tables[table.name] = table
+        table.sheet = self
 
     def insert_cell(
         self,
@@ -344,6 +809,51 @@ class Sheet:
             'y_scale': options.get('y_scale', 1),
         }
 
+    def insert_chart(
+        self,
+        chart_type: str,
+        values: List[Column],
+        coordinate: Union[str, Tuple],
+        categories: Column = None,
+        options: Dict = None,
+    ):
+        """Insert a native Excel chart plotting the data rows of columns of the sheet's tables.
+
+        Args:
+            chart_type (str): The xlsxwriter chart type, e.g. "line", "column" or "pie".
+            values (List[Column]): The columns plotted as series, named after their header cell.
+            coordinate (Union[str, Tuple]): The cell the chart is inserted at, either 'A1' or (0, 0).
+            categories (Column): The column holding the categories of the series.
+            options (Dict): The xlsxwriter chart options, e.g. {"title": {"name": "Scores"}, "x_scale": 1.5}.
+        """
+        for column in values + ([categories] if categories else []):
+            check_sheet_column(column)
+        for column in values:
+            column.numeric = True
+
+        self.charts.append({
+            "type": chart_type,
+            "values": values,
+            "categories": categories,
+            "coordinate": to_coordinate(coordinate),
+            "options": options if options else dict(),
+        })
+
+    def insert_sparkline(self, column: Column, coordinate: Union[str, Tuple], options: Dict = None):
+        """Insert a sparkline drawn from the data rows of a column.
+
+        Args:
+            column (Column): The column the sparkline is drawn from.
+            coordinate (Union[str, Tuple]): The cell the sparkline is drawn in, either 'A1' or (0, 0).
+            options (Dict): The xlsxwriter sparkline options, e.g. {"type": "column", "markers": True}.
+        """
+        check_sheet_column(column)
+        column.numeric = True
+
+        self.sparklines.append({
+            "column": column, "coordinate": to_coordinate(coordinate), "options": options if options else dict()
+        })
+
     @staticmethod
     def merge(cells: List[Cell]):
         min_range, max_range = (float("inf"), float("inf")), (
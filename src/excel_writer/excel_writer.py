@@ -1,26 +1,98 @@
+import math
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from io import BytesIO
 from collections import defaultdict
-from itertools import chain
+from itertools import chain, islice, zip_longest
 from ast import literal_eval
 from typing import Dict, List
 
 import xlsxwriter.worksheet
 from xlsxwriter import Workbook
+from xlsxwriter.utility import quote_sheetname, xl_range_abs, xl_rowcol_to_cell
 
-from .excel import Sheet, Table, Cell
+from .excel import Sheet, Table, Column, Cell, format_key
+from .packager import ZipPackager, check_compression_level
+from .backend import XlsxWriterBackend
+
+
+def write_workbook(filename: str, sheets: List[Sheet], compression_level: int = 6, max_workers: int = None,
+                   backend: XlsxWriterBackend = None):
+    """Write sheets to an Excel file, used to render the workbook shards in separate processes.
+
+    Returns:
+        List[Dict]: The manifest of the tables written to the file.
+    """
+    return ExcelWriter(filename, sheets, compression_level, max_workers, backend=backend).write_excel_sheets()
+
+
+NUMBER = re.compile(r"[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?")
+
+
+def to_number(data: str):
+    """Return the data as a float if it is written as a plain finite number, e.g. not "1_000" or " 7 ", else None."""
+    if not NUMBER.fullmatch(data):
+        return None
+    number = float(data)
+
+    return number if math.isfinite(number) else None
+
+
+def shard_filename(filename: str, k: int) -> str:
+    """Return the name of the k-th workbook shard, e.g. output_2.xlsx for output.xlsx."""
+    root, ext = os.path.splitext(filename)
+
+    return f"{root}_{k}{ext}"
 
 
 class ExcelWriter(Workbook):
-    def __init__(self, filename: str, sheets: List[Sheet]):
+    def __init__(self, filename: str, sheets: List[Sheet], compression_level: int = 6, max_workers: int = None,
+                 sheets_per_workbook: int = None, max_processes: int = None, backend: XlsxWriterBackend = None):
         """Initialize the ExcelWriter with a filename and a list of sheets.
 
         Args:
             filename (str): The name of the Excel file to be created.
             sheets (List[Sheet]): A list of Sheet objects to be written to the Excel file.
+            compression_level (int): zlib compression level of the xlsx parts, 0 stores them uncompressed.
+            max_workers (int): The number of threads compressing the xlsx parts. Defaults to the number of cores.
+            sheets_per_workbook (int): The maximum number of sheets of a file, the others are written to
+                further files named after the filename, e.g. output_2.xlsx.
+            max_processes (int): The number of processes rendering those further files. Defaults to the number of cores.
+            backend (XlsxWriterBackend): The backend writing the cells, e.g. StreamBackend. Defaults to xlsxwriter.
         """
+        check_compression_level(compression_level)
         super().__init__(filename)
         self.filename = filename
         self.sheets = sheets
+        self.compression_level = compression_level
+        self.max_workers = max_workers
+        self.sheets_per_workbook = sheets_per_workbook
+        self.max_processes = max_processes
+        self.backend = backend if backend else XlsxWriterBackend()
+        self.packager = None
+        self.__formats = dict()
+        self.__table_names = set()
+
+    def _get_packager(self):
+        """Return the packager xlsxwriter writes the XML parts with, overriding the default one."""
+        self.packager = ZipPackager(self.compression_level, self.max_workers)
+
+        return self.packager
+
+    def _store_workbook(self):
+        """Assemble the workbook and package its parts in parallel instead of zipping them one by one.
+
+        xlsxwriter is given an in-memory sink to write its (empty) archive to, the parts are then
+        compressed and written to the real file by the ZipPackager.
+        """
+        filename, self.filename = self.filename, BytesIO()
+        try:
+            super()._store_workbook()
+        finally:
+            self.filename = filename
+
+        self.packager.write(self.filename)
 
     def __parse_data_format(self, data: str, cell_format: Dict, data_format: Dict):
         """Return a list of tuples containing formats and characters for formatted strings.
@@ -68,7 +140,7 @@ class ExcelWriter(Workbook):
         Returns:
             xlsxwriter.worksheet.Worksheet: The initialized and configured worksheet.
         """
-        sheet = self.add_worksheet(sheet_data.name)
+        sheet = self.add_worksheet(sheet_data.name, worksheet_class=self.backend.worksheet_class)
         if sheet_data.freeze_panes:
             for freeze_pane in sheet_data.freeze_panes:
                 sheet.freeze_panes(*freeze_pane)
@@ -90,34 +162,144 @@ class ExcelWriter(Workbook):
 
         return sheet
 
-    def write_excel_sheets(self):
+    def __get_format(self, cell_format: Dict):
+        """Return the xlsxwriter format of a format dict, adding it to the workbook only once.
+
+        Args:
+            cell_format (Dict): The format dict of a Sheet, Table, Column or Cell.
+
+        Returns:
+            xlsxwriter.format.Format: The workbook format, or None if cell_format is None.
+        """
+        if cell_format is None:
+            return None
+
+        key = format_key(cell_format)
+        if key not in self.__formats:
+            self.__formats[key] = self.add_format(cell_format)
+
+        return self.__formats[key]
+
+    def write_excel_sheets(self) -> List[Dict]:
         """Write all the Excel sheets defined in the 'sheets' list to the Excel file.
 
         This method initializes each sheet, writes data and configurations to them,
         and closes the workbook, which finalizes the Excel file.
 
+        Tables with more rows than they can hold are split across continuation sheets (see `Sheet.shard`).
+        If there are more sheets than `sheets_per_workbook`, the remaining ones are rendered in parallel
+        into further files, handing at most `max_processes` of them to the processes at a time.
+
         Note:
             The workbook is automatically closed by xlsxwriter once this method completes.
+
+        Returns:
+            List[Dict]: The manifest of the tables written, with the file, sheet and table names and the
+                range of the table's data rows each of them holds.
         """
+        sheet_names = [sheet_data.name for sheet_data in self.sheets]
+        sheets = []
+        for sheet_data in self.sheets:
+            sheets.extend(sheet_data.shard(sheet_names + [sheet.name for sheet in sheets]))
+        n = self.sheets_per_workbook if self.sheets_per_workbook else max(len(sheets), 1)
+        self.sheets, *workbooks = [sheets[i:i + n] for i in range(0, max(len(sheets), 1), n)]
+        self.__check_sheet_charts([self.sheets] + workbooks)
+        if workbooks and not isinstance(self.filename, str):
+            raise ValueError("The sheets can be split into several workbooks only when the filename is a path.")
+
+        if not workbooks:
+            return self.__write_workbook()
+
+        # The sheets of a workbook are pickled when it is submitted, only a few are handed over at a time.
+        max_in_flight = self.max_processes if self.max_processes else os.cpu_count()
+        queue = list(enumerate(workbooks, start=2))[::-1]
+        futures, manifests = dict(), dict()
+        with ProcessPoolExecutor(max_workers=self.max_processes) as executor:
+            manifest = None
+            while queue or futures:
+                while queue and len(futures) < max_in_flight:
+                    k, workbook = queue.pop()
+                    future = executor.submit(
+                        write_workbook, shard_filename(self.filename, k), workbook, self.compression_level,
+                        self.max_workers, self.backend,
+                    )
+                    futures[future] = k, workbook
+                if manifest is None:
+                    manifest = self.__write_workbook()
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    k, workbook = futures.pop(future)
+                    manifests[k] = future.result()
+                    for sheet_data in workbook:
+                        for table in sheet_data.tables.values():
+                            table.close()
+
+        for k in sorted(manifests):
+            manifest.extend(manifests[k])
+
+        return manifest
+
+    @staticmethod
+    def __check_sheet_charts(workbooks: List[List[Sheet]]):
+        """Reject the charts and sparklines of sheets drawn from columns of tables split across sheets,
+        or of tables whose sheet is not written to the same workbook."""
+        for workbook in workbooks:
+            sheet_ids = {id(sheet_data) for sheet_data in workbook}
+            for sheet_data in workbook:
+                columns = [
+                    column for chart in sheet_data.charts for column in chart["values"] + [chart["categories"]]
+                ]
+                columns.extend(sparkline["column"] for sparkline in sheet_data.sparklines)
+                for column in columns:
+                    if column is None:
+                        continue
+                    if column.table.sharded:
+                        raise ValueError(
+                            f"The sheet '{sheet_data.name}' charts the column '{column.name}' of the table "
+                            f"'{column.table.name}' which is split across sheets. Chart it with Table.add_chart "
+                            f"instead."
+                        )
+                    if id(column.table.sheet) not in sheet_ids:
+                        raise ValueError(
+                            f"The sheet '{sheet_data.name}' charts the column '{column.name}' of the sheet "
+                            f"'{column.table.sheet.name}' which is not written to the same workbook."
+                        )
+
+    def __write_workbook(self) -> List[Dict]:
+        """Write the sheets to this workbook, close it and return its manifest."""
+        manifest = []
         for sheet_data in self.sheets:
             sheet = self.__init_sheet(sheet_data)
             self.__write_excel_sheet(sheet, sheet_data)
+            manifest.extend(
+                {
+                    "filename": self.filename,
+                    "sheet": sheet_data.name,
+                    "table": table.name,
+                    "rows": table.shard_range if table.shard_range else (0, table.get_n_rows()),
+                }
+                for table in sheet_data.tables.values()
+            )
 
         self.close()
 
-    def __write_cells(self, merge_dict: Dict, cells: List[Cell], sheet: Sheet):
+        return manifest
+
+    def __write_cells(self, merge_dict: Dict, cells: List[Cell], sheet: Sheet, numeric: bool = False):
         """ write a "rich" string with multiple formats to a worksheet cell and merge cells and write data into cells
 
         Args:
             merge_dict (Dict): A dictionary with tuples as keys for cell ranges to be merged and values as the cell data.
             cells: List of Sheet, Cell, and Table Objects
             sheet (Sheet): A Sheet object containing the configuration and data for the worksheet.
+            numeric (bool): Write the cells holding numbers as numbers, e.g. for the columns charts are drawn from.
 
         Returns:
 
         """
         for cell in cells:
-            cell_format = self.add_format(cell.cell_format)
+            cell_format = self.__get_format(cell.cell_format)
 
             # Write generic data to a worksheet cell.
 
@@ -129,13 +311,10 @@ class ExcelWriter(Workbook):
                     string=cell.data,
                     cell_format=cell_format,
                 )
-            else:
-                sheet.write(
-                    cell.x,
-                    cell.y,
-                    cell.data,
-                    cell_format,
-                )
+            elif numeric and to_number(cell.data) is not None:
+                sheet.write_number(cell.x, cell.y, to_number(cell.data), cell_format)
+            elif not cell.data_format:
+                self.backend.write_cell(sheet, cell, cell_format)
 
             # Write a "rich" string with multiple formats to a worksheet cell.
             if cell.data_format:
@@ -161,12 +340,13 @@ class ExcelWriter(Workbook):
 
         return
 
-    def __merge_cells_and_write_data(self, merge_dict, sheet):
+    def __merge_cells_and_write_data(self, merge_dict, sheet, numeric_columns: set = None):
         """ merge cells and write data into cells
 
         Args:
             merge_dict (Dict): data to merge in dict.
             sheet (Sheet): A Sheet object containing the configuration and data for the worksheet.
+            numeric_columns (set): The columns whose merged numbers are written as numbers.
 
         """
         for merge_range, cells in merge_dict.items():
@@ -177,11 +357,15 @@ class ExcelWriter(Workbook):
                 merged_format["right"] = right_down_format.get("right", 0)
                 merged_format["bottom"] = right_down_format.get("bottom", 0)
 
+                data = cells[0].data
+                if numeric_columns and min_range[1] in numeric_columns and to_number(data) is not None:
+                    data = to_number(data)
+
                 sheet.merge_range(
                     *min_range,
                     *max_range,
-                    cells[0].data,
-                    self.add_format(merged_format)
+                    data,
+                    self.__get_format(merged_format)
                 )
         return
 
@@ -198,6 +382,7 @@ class ExcelWriter(Workbook):
         """
         for table in sheet_data.tables.values():
             self.__write_table(sheet, table)
+            table.close()
 
         if sheet_data.images:
             for key, image_data in sheet_data.images.items():
@@ -213,6 +398,15 @@ class ExcelWriter(Workbook):
                     row, column, "image.png", options
                 )
 
+        for chart, columns in self.__get_charts(sheet_data):
+            self.__insert_chart(sheet, chart, *columns)
+
+        for sparkline in sheet_data.sparklines:
+            self.__insert_sparkline(sheet, sparkline["column"], sparkline["coordinate"], sparkline["options"])
+        for table in sheet_data.tables.values():
+            for sparkline in table.sparklines:
+                self.__add_table_sparklines(sheet, table, sparkline)
+
         if sheet_data.cells:
             merge_dict = defaultdict(list)
             self.__write_cells(merge_dict, sheet_data.cells, sheet)
@@ -220,6 +414,100 @@ class ExcelWriter(Workbook):
 
         sheet.ignore_errors({"number_stored_as_text": "A1:XFD1048576"})
 
+    @staticmethod
+    def __get_charts(sheet_data: Sheet):
+        """Return the charts of the sheet and of its tables along with the columns of their values and categories."""
+        charts = [(chart, (chart["values"], chart["categories"])) for chart in sheet_data.charts]
+        for table in sheet_data.tables.values():
+            charts.extend(
+                (
+                    chart,
+                    (
+                        [table.columns[name] for name in chart["values"]],
+                        table.columns[chart["categories"]] if chart["categories"] else None,
+                    ),
+                )
+                for chart in table.charts
+            )
+
+        return charts
+
+    @staticmethod
+    def __get_data_range(column: Column) -> List:
+        """Return the first row, the column, the last row and the column of the data rows of a column."""
+        return [column.x + 1, column.y, column.x + max(len(column.cells) - 1, 1), column.y]
+
+    def __insert_chart(self, sheet: xlsxwriter.worksheet.Worksheet, chart: Dict, values: List[Column],
+                       categories: Column = None):
+        """Insert a native chart whose series reference the data rows of columns.
+
+        Args:
+            sheet (xlsxwriter.worksheet.Worksheet): The worksheet to insert the chart into.
+            chart (Dict): The chart added with Sheet.insert_chart or Table.add_chart.
+            values (List[Column]): The columns plotted as series.
+            categories (Column): The column holding the categories of the series.
+        """
+        options = dict(chart["options"])
+        x_scale, y_scale = options.pop("x_scale", 1), options.pop("y_scale", 1)
+        title, x_axis, y_axis, legend = (options.pop(key, None) for key in ("title", "x_axis", "y_axis", "legend"))
+        excel_chart = self.add_chart({"type": chart["type"], **options})
+        for column in values:
+            series = {
+                "name": [column.table.sheet.name, column.x, column.y],
+                "values": [column.table.sheet.name, *self.__get_data_range(column)],
+            }
+            if categories:
+                series["categories"] = [categories.table.sheet.name, *self.__get_data_range(categories)]
+            excel_chart.add_series(series)
+
+        if title:
+            excel_chart.set_title(title)
+        if x_axis:
+            excel_chart.set_x_axis(x_axis)
+        if y_axis:
+            excel_chart.set_y_axis(y_axis)
+        if legend:
+            excel_chart.set_legend(legend)
+
+        sheet.insert_chart(*chart["coordinate"], excel_chart, {"x_scale": x_scale, "y_scale": y_scale})
+
+    @staticmethod
+    def __insert_sparkline(sheet: xlsxwriter.worksheet.Worksheet, column: Column, coordinate, options: Dict):
+        """Insert a sparkline drawn from the data rows of a column.
+
+        Args:
+            sheet (xlsxwriter.worksheet.Worksheet): The worksheet to insert the sparkline into.
+            column (Column): The column the sparkline is drawn from.
+            coordinate: The (row, column) of the cell the sparkline is drawn in.
+            options (Dict): The xlsxwriter sparkline options.
+        """
+        data_range = (
+            quote_sheetname(column.table.sheet.name) + "!" + xl_range_abs(*ExcelWriter.__get_data_range(column))
+        )
+        sheet.add_sparkline(*coordinate, {**options, "range": data_range})
+
+    @staticmethod
+    def __add_table_sparklines(sheet: xlsxwriter.worksheet.Worksheet, table: Table, sparkline: Dict):
+        """Add a sparkline to every data row of a table, grouped as one sparkline group.
+
+        Args:
+            sheet (xlsxwriter.worksheet.Worksheet): The worksheet to add the sparklines to.
+            table (Table): The table the sparklines are drawn from.
+            sparkline (Dict): The sparklines added with Table.add_sparklines.
+        """
+        n_rows = table.get_n_rows()
+        if n_rows < 1:
+            return
+
+        target = table.columns[sparkline["target"]].y
+        ys = [table.columns[name].y for name in sparkline["columns"]]
+        rows = range(table.x + 1, table.x + 1 + n_rows)
+        sheet.add_sparkline(table.x + 1, target, {
+            **sparkline["options"],
+            "location": [xl_rowcol_to_cell(row, target) for row in rows],
+            "range": [quote_sheetname(sheet.name) + "!" + xl_range_abs(row, min(ys), row, max(ys)) for row in rows],
+        })
+
     def __write_table(self, sheet: xlsxwriter.worksheet.Worksheet, table: Table):
         """Write a table's data, formats, merged cells, and comments to an Excel worksheet.
 
@@ -231,11 +519,17 @@ class ExcelWriter(Workbook):
              sheet (xlsxwriter.worksheet.Worksheet): The worksheet to write the table data to.
              table (Table): A Table object containing the columns and cell data to write.
          """
+        if table.table_style:
+            self.__write_native_table(sheet, table)
+            return
+
         merge_dict = defaultdict(list)
         for column in table.columns.values():
-            self.__write_cells(merge_dict, column.cells, sheet)
+            self.__write_cells(merge_dict, column.cells, sheet, column.numeric)
 
-        self.__merge_cells_and_write_data(merge_dict, sheet)
+        self.__merge_cells_and_write_data(
+            merge_dict, sheet, {column.y for column in table.columns.values() if column.numeric}
+        )
 
         # An auto filter in Excel
         if table.filter_option:
@@ -245,3 +539,93 @@ class ExcelWriter(Workbook):
                 table.x + len(table.columns[list(table.columns.keys())[0]].cells),
                 table.y + table.n - 1,
             )
+
+    def __write_native_table(self, sheet: xlsxwriter.worksheet.Worksheet, table: Table):
+        """Write a table as a native Excel table (ListObject) styled by its table style.
+
+        The first cell of each column is the header row and the column formats are given to the
+        table once. Only the cells whose format differs from their column format, or which carry
+        urls, rich strings or comments, are written again with an explicit format.
+
+        Args:
+            sheet (xlsxwriter.worksheet.Worksheet): The worksheet to write the table to.
+            table (Table): A Table object with a table_style, containing the columns and cell data to write.
+        """
+        columns = list(table.columns.values())
+        if any(cell.merge_range for column in columns for cell in column.cells):
+            raise ValueError(f"Merged cells can not be drawn in the native table '{table.name}'.")
+
+        total_row = any(column.total_function for column in columns)
+        options = {
+            "name": self.__get_table_name(table.name),
+            "style": table.table_style,
+            "autofilter": table.filter_option,
+            "total_row": total_row,
+            "columns": [],
+            "data": [
+                [self.__get_value(cell, column.numeric) for cell, column in zip(row, columns)]
+                for row in zip_longest(*[islice(column.cells, 1, None) for column in columns])
+            ],
+        }
+        overrides = dict()
+        for column in columns:
+            column_format = self.__get_format(column.column_format)
+            header = column.cells[0] if column.cells else None
+            column_options = {"header": header.data if header else column.name, "format": column_format}
+            if header and header.cell_format != column.column_format:
+                column_options["header_format"] = self.__get_format(header.cell_format)
+            if column.total_function:
+                column_options["total_function"] = column.total_function
+            options["columns"].append(column_options)
+
+            overrides[column] = [
+                cell for cell in islice(column.cells, 1, None)
+                if cell.cell_format != column.column_format or cell.url or cell.data_format or cell.comments
+            ]
+
+        n_rows = max(len(options["data"]), 1)
+        if sheet.add_table(table.x, table.y, table.x + n_rows + total_row, table.y + table.n - 1, options):
+            raise ValueError(f"The native table '{table.name}' could not be added to the sheet '{sheet.name}'.")
+        for column, cells in overrides.items():
+            self.__write_cells(defaultdict(list), cells, sheet, column.numeric)
+
+    def __get_table_name(self, name: str) -> str:
+        """Return a valid Excel table name for a table, unique within the workbook.
+
+        Characters other than letters, digits, "_", "." and "\\" are replaced with "_", names starting
+        with a digit or a dot, or looking like a cell reference, are prefixed with "_", and names already
+        taken (case-insensitively, e.g. by a table of the same name on another sheet) get a suffix.
+
+        Args:
+            name (str): The name of the table.
+
+        Returns:
+            str: The name the native table is added with.
+        """
+        name = re.sub(r"[^\w.\\]", "_", name)[:250]
+        if (
+            not name or re.match(r"[\d.]", name) or re.fullmatch(r"[a-zA-Z]{1,3}\d+", name)
+            or re.fullmatch(r"[rcRC]|[rcRC]\d+[rcRC]\d+", name)
+        ):
+            name = "_" + name
+
+        unique_name, k = name, 1
+        while unique_name.lower() in self.__table_names:
+            k += 1
+            unique_name = f"{name}_{k}"
+        self.__table_names.add(unique_name.lower())
+
+        return unique_name
+
+    @staticmethod
+    def __get_value(cell: Cell, numeric: bool):
+        """Return the value a native table is given for a cell, a number for the numeric columns.
+
+        Rich strings are left empty as they are written over the table afterwards.
+        """
+        if cell is None or cell.data_format:
+            return None
+        if numeric and to_number(cell.data) is not None:
+            return to_number(cell.data)
+
+        return cell.data
@@ -0,0 +1,200 @@
+import os
+import shutil
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO, StringIO
+from typing import BinaryIO, List, Optional, Tuple
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
+from xlsxwriter.packager import Packager
+
+# Excel's timestamp of 1/1/1980 in MS-DOS date/time format.
+DOS_TIME, DOS_DATE = 0, (0 << 9) | (1 << 5) | 1
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+CHUNK_SIZE = 1 << 20
+
+
+def check_compression_level(compression_level: int):
+    if not isinstance(compression_level, int) or not 0 <= compression_level <= 9:
+        raise ValueError("Invalid compression_level value. Must be an integer between 0 and 9.")
+
+
+class ZipPackager(Packager):
+    def __init__(self, compression_level: int = 6, max_workers: int = None):
+        """Initialize a packager that compresses the XML parts of the workbook in parallel.
+
+        Args:
+            compression_level (int): zlib compression level from 0 to 9. 0 stores the parts uncompressed.
+            max_workers (int): The number of threads to compress with. Defaults to the number of cores.
+        """
+        super().__init__()
+        check_compression_level(compression_level)
+
+        self.compression_level = compression_level
+        self.max_workers = max_workers if max_workers else os.cpu_count()
+        self.parts = []
+
+    def _create_package(self):
+        """Write the XML parts and keep them for `write`, leaving nothing for xlsxwriter to zip."""
+        self.parts = super()._create_package()
+
+        return []
+
+    @staticmethod
+    def __open_part(part: Tuple) -> BinaryIO:
+        """Open a part written by xlsxwriter for reading.
+
+        Args:
+            part (Tuple): A tuple of (os_filename, xml_filename, is_binary) as created by xlsxwriter.
+
+        Returns:
+            BinaryIO: A binary file object holding the raw content of the part.
+        """
+        os_filename, _, _ = part
+        if isinstance(os_filename, StringIO):
+            return BytesIO(os_filename.getvalue().encode("utf-8"))
+        if not isinstance(os_filename, str):
+            return BytesIO(os_filename.getvalue())
+
+        return open(os_filename, "rb")
+
+    @staticmethod
+    def __get_size(part: Tuple) -> int:
+        """Return the size of the raw content of a part, without reading the temp files."""
+        os_filename, _, _ = part
+        if isinstance(os_filename, StringIO):
+            return len(os_filename.getvalue().encode("utf-8"))
+        if not isinstance(os_filename, str):
+            return len(os_filename.getvalue())
+
+        return os.path.getsize(os_filename)
+
+    def __compress_part(self, part: Tuple) -> Tuple[int, Optional[List[bytes]], int]:
+        """Deflate a single part read in chunks. zlib releases the GIL so parts are compressed concurrently.
+
+        Args:
+            part (Tuple): A tuple of (os_filename, xml_filename, is_binary) as created by xlsxwriter.
+
+        Returns:
+            Tuple[int, Optional[List[bytes]], int]: The size of the raw data, the compressed chunks and the crc32
+                of the raw data. The chunks are None when the parts are stored, they are copied from the part.
+        """
+        compressor = None
+        if self.compression_level:
+            compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+        size, chunks, crc = 0, [], 0
+        with self.__open_part(part) as f:
+            for data in iter(lambda: f.read(CHUNK_SIZE), b""):
+                size += len(data)
+                crc = zlib.crc32(data, crc)
+                if compressor:
+                    chunks.append(compressor.compress(data))
+        if not compressor:
+            return size, None, crc
+        chunks.append(compressor.flush())
+
+        return size, chunks, crc
+
+    def write(self, filename) -> None:
+        """Write the xlsx zip container from the parts compressed in parallel.
+
+        Args:
+            filename: The path or file-like object of the xlsx file to be created.
+        """
+        try:
+            # Deflating may slightly expand incompressible data, hence the margin.
+            sizes = [self.__get_size(part) for part in self.parts]
+            if len(self.parts) >= ZIP32_MAX_ENTRIES or sum(size + size // 100 + 1024 for size in sizes) >= ZIP32_LIMIT:
+                self.__write_zip64(filename)
+            elif isinstance(filename, str):
+                with open(filename, "wb") as f:
+                    self.__write_zip(f)
+            else:
+                self.__write_zip(filename)
+        finally:
+            for os_filename, _, _ in self.parts:
+                if isinstance(os_filename, str):
+                    os.remove(os_filename)
+            self.parts = []
+
+    def __write_zip(self, f) -> None:
+        """Write the local headers, the compressed data and the central directory of a zip32 archive.
+
+        The parts are written in order as soon as they are compressed, at most `max_workers` parts
+        ahead of the one being written are compressed at a time.
+
+        Args:
+            f: A binary file object to write the archive to.
+        """
+        central_directory = []
+        offset = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for part in self.parts:
+                pending.append((part, executor.submit(self.__compress_part, part)))
+                if len(pending) > self.max_workers:
+                    offset = self.__write_entry(f, *pending.popleft(), offset, central_directory)
+            while pending:
+                offset = self.__write_entry(f, *pending.popleft(), offset, central_directory)
+
+        central_directory = b"".join(central_directory)
+        f.write(central_directory)
+        f.write(struct.pack(
+            "<4s4H2LH", b"PK\005\006", 0, 0, len(self.parts), len(self.parts), len(central_directory), offset, 0
+        ))
+
+    def __write_entry(self, f, part: Tuple, future: Future, offset: int, central_directory: List[bytes]) -> int:
+        """Write the local header and the data of a part, and add its record to the central directory.
+
+        Returns:
+            int: The offset of the next entry.
+        """
+        size, chunks, crc = future.result()
+        compress_type = ZIP_DEFLATED if self.compression_level else ZIP_STORED
+        stored_size = sum(len(chunk) for chunk in chunks) if chunks is not None else size
+        name = part[1].encode("utf-8")
+        local_header = struct.pack(
+            "<4s2B4HL2L2H", b"PK\003\004", 20, 0, 0, compress_type,
+            DOS_TIME, DOS_DATE, crc, stored_size, size, len(name), 0,
+        )
+        f.write(local_header)
+        f.write(name)
+        if chunks is not None:
+            f.writelines(chunks)
+        else:
+            with self.__open_part(part) as source:
+                shutil.copyfileobj(source, f, CHUNK_SIZE)
+        central_directory.append(struct.pack(
+            "<4s4B4HL2L5H2L", b"PK\001\002", 20, 0, 20, 0, 0, compress_type,
+            DOS_TIME, DOS_DATE, crc, stored_size, size, len(name), 0, 0, 0, 0, 0, offset,
+        ) + name)
+
+        return offset + len(local_header) + len(name) + stored_size
+
+    def __write_zip64(self, filename) -> None:
+        """Write the archive with zipfile when it needs the ZIP64 extensions, streaming the parts serially.
+
+        Args:
+            filename: The path or file-like object of the xlsx file to be created.
+        """
+        compress_type = ZIP_DEFLATED if self.compression_level else ZIP_STORED
+        with ZipFile(
+            filename, "w", compression=compress_type, allowZip64=True, compresslevel=self.compression_level or None
+        ) as xlsx_file:
+            for part in self.parts:
+                os_filename, xml_filename, _ = part
+                if isinstance(os_filename, str):
+                    # As xlsxwriter does, as 1/1/1980 can not be set portably on the temp files.
+                    timestamp = time.mktime((1980, 1, 31, 0, 0, 0, 0, 0, -1))
+                    os.utime(os_filename, (timestamp, timestamp))
+                    xlsx_file.write(os_filename, xml_filename)
+                else:
+                    zipinfo = ZipInfo(xml_filename, (1980, 1, 1, 0, 0, 0))
+                    zipinfo.compress_type = compress_type
+                    with self.__open_part(part) as source:
+                        xlsx_file.writestr(zipinfo, source.read(), compresslevel=self.compression_level or None)
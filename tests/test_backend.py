@@ -0,0 +1,31 @@
+from excel_writer import ExcelWriter, Sheet, XlsxWriterBackend, StreamBackend, Format
+
+import sample_excelwriter
+from test_grouped import STUDENTS, read_parts
+
+
+def make_special_sheet() -> Sheet:
+    sheet = Sheet(name="Special")
+    table = sheet.get_and_add_table(table_name="Cells", draw_from=(0, 0), table_format=Format({"left": 1}))
+    column = table.get_and_add_column("Value", width=20)
+    for data in ["Value", "https://example.com", "=1+1", "", "x" * 40000, "plain", "plain", "a:b", "{not a formula"]:
+        column.get_and_add_cell(data)
+    column.get_and_add_cell("link", url="https://example.com/link")
+    sheet.insert_cell("Great Job!", "C2", cell_format=Format().font_color("red"))
+
+    return sheet
+
+
+def test_backends_write_the_same_parts(tmp_path):
+    parts = []
+    for backend in [XlsxWriterBackend(), StreamBackend()]:
+        sheet = sample_excelwriter.export_student_sheet(STUDENTS)
+        special = make_special_sheet()
+
+        filename = str(tmp_path / f"{type(backend).__name__}.xlsx")
+        ExcelWriter(filename, [sheet, special], backend=backend).write_excel_sheets()
+        parts.append(read_parts(filename))
+
+    assert parts[0] == parts[1]
+    special_xml = parts[1]["xl/worksheets/sheet2.xml"].decode()
+    assert "<f>1+1</f>" in special_xml and 'r="A5"' in special_xml
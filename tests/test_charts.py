@@ -0,0 +1,84 @@
+import zipfile
+
+import re
+
+import pytest
+
+from excel_writer import ExcelWriter, Sheet, Column
+from excel_writer.excel_writer import to_number
+
+
+def make_data_sheet(values, max_rows: int = None) -> Sheet:
+    sheet = Sheet(name="Data")
+    table = sheet.get_and_add_table(table_name="Records", draw_from=(0, 0), max_rows=max_rows)
+    column = table.get_and_add_column("Value")
+    column.get_and_add_cell("Value")
+    for value in values:
+        column.get_and_add_cell(value)
+
+    return sheet
+
+
+def test_sheet_chart_references_the_sheet_owning_the_column(tmp_path):
+    data = make_data_sheet([1, 2, 3])
+    other = Sheet(name="Other")
+    other.insert_chart("line", [data.get_table("Records").get_column("Value")], "B2")
+    other.insert_sparkline(data.get_table("Records").get_column("Value"), "A1")
+
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, [data, other]).write_excel_sheets()
+
+    with zipfile.ZipFile(filename) as xlsx_file:
+        chart = xlsx_file.read("xl/charts/chart1.xml").decode()
+        other_xml = xlsx_file.read("xl/worksheets/sheet2.xml").decode()
+        data_xml = xlsx_file.read("xl/worksheets/sheet1.xml").decode()
+    assert "<c:f>Data!$A$2:$A$4</c:f>" in chart
+    assert "<xm:f>Data!A2:A4</xm:f>" in other_xml
+    # The charted cells are numbers, the header stays a shared string.
+    assert re.search(r'<c r="A1"[^>]* t="s">', data_xml)
+    assert re.findall(r'<c r="A[234]"[^>]*><v>([^<]*)</v>', data_xml) == ["1", "2", "3"]
+
+
+def test_table_chart_on_shards_references_each_shard(tmp_path):
+    data = make_data_sheet(range(6), max_rows=3)
+    data.get_table("Records").add_chart("line", ["Value"], "C2")
+
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, [data]).write_excel_sheets()
+
+    with zipfile.ZipFile(filename) as xlsx_file:
+        charts = [xlsx_file.read(f"xl/charts/chart{i}.xml").decode() for i in (1, 2)]
+    assert "<c:f>Data!$A$2:$A$4</c:f>" in charts[0]
+    assert "<c:f>'Data (2)'!$A$2:$A$4</c:f>" in charts[1]
+
+
+def test_sheet_chart_on_sharded_table_is_rejected(tmp_path):
+    data = make_data_sheet(range(6), max_rows=3)
+    data.insert_chart("line", [data.get_table("Records").get_column("Value")], "C2")
+
+    with pytest.raises(ValueError):
+        ExcelWriter(str(tmp_path / "output.xlsx"), [data]).write_excel_sheets()
+
+
+def test_chart_of_column_outside_a_sheet_is_rejected():
+    sheet = Sheet(name="Data")
+    with pytest.raises(ValueError):
+        sheet.insert_chart("line", [Column("A", 5, 0, 0)], "A1")
+
+
+@pytest.mark.parametrize("data, expected", [
+    ("7", 7.0), ("-1.5", -1.5), ("1e3", 1000.0), (".5", 0.5),
+    ("1_000", None), (" 7 ", None), ("nan", None), ("inf", None), ("", None), ("abc", None),
+])
+def test_to_number(data, expected):
+    assert to_number(data) == expected
+
+
+def test_sheet_chart_of_a_sheet_in_another_workbook_is_rejected(tmp_path):
+    data = make_data_sheet([1, 2, 3])
+    other = Sheet(name="Other")
+    other.insert_chart("line", [data.get_table("Records").get_column("Value")], "B2")
+
+    with pytest.raises(ValueError):
+        ExcelWriter(str(tmp_path / "output.xlsx"), [data, other], sheets_per_workbook=1).write_excel_sheets()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,68 @@
+import re
+import zipfile
+
+import pytest
+
+from excel_writer import ExcelWriter, Sheet, Line
+
+import sample_excelwriter
+import sample_excelwriter_grouped
+
+STUDENTS = {
+    "DongHun Kim": [("Math", 99), ("Biology", 60), ("Computer Science", 100)],
+    "Jiyeon Yoo": [("Math", 70), ("Biology", 90)],
+    "William Kim": [("Music", 59), ("Art", 73)],
+    "Judy Yoo": [("Math", 54), ("Computer Science", 55)],
+}
+
+
+def read_parts(filename: str) -> dict:
+    with zipfile.ZipFile(filename) as xlsx_file:
+        return {name: xlsx_file.read(name) for name in xlsx_file.namelist() if name != "docProps/core.xml"}
+
+
+def test_grouped_sample_matches_the_manual_sample(tmp_path):
+    filenames = []
+    for i, sample in enumerate([sample_excelwriter, sample_excelwriter_grouped]):
+        filename = str(tmp_path / f"output_{i}.xlsx")
+        ExcelWriter(filename, [sample.export_student_sheet(STUDENTS)]).write_excel_sheets()
+        filenames.append(filename)
+
+    manual, grouped = map(read_parts, filenames)
+    assert grouped == manual
+    merge_ranges = re.findall(r'<mergeCell ref="([^"]*)"/>', grouped["xl/worksheets/sheet1.xml"].decode())
+    assert merge_ranges == ["E3:E5", "E6:E7", "E8:E9", "E10:E11"]
+
+
+def test_add_grouped_merges_and_divides_the_groups():
+    sheet = Sheet(name="Students")
+    table = sheet.get_and_add_table(table_name="Records", draw_from=(1, 1))
+    for name in ["Name", "Subject", "Score", "Average"]:
+        table.get_and_add_column(name).get_and_add_cell(name)
+
+    n_groups = table.add_grouped(
+        [(name, subject, score) for name, records in STUDENTS.items() for subject, score in records],
+        group_by="Name",
+        merge_columns=["Average"],
+        aggregates={"Average": lambda group: sum(row["Score"] for row in group) / len(group)},
+        divider=Line.THICK,
+    )
+
+    assert n_groups == 4
+    score_cells = table.get_column("Score").cells[1:]
+    assert [cell.data for cell in score_cells] == ["99", "60", "100", "70", "90", "59", "73", "54", "55"]
+    average_cells = table.get_column("Average").cells[1:]
+    assert [cell.data for cell in average_cells[:3]] == ["86.33333333333333"] * 3
+    assert [cell.merge_range for cell in average_cells[3:5]] == [((5, 4), (6, 4))] * 2
+    divided = [cell.x for cell in score_cells if cell.cell_format.get("bottom") == Line.THICK.value]
+    assert divided == [4, 6, 8, 10]
+
+
+@pytest.mark.parametrize("options", [{"merge_columns": ["Nope"]}, {"aggregates": {"Avg": len}}])
+def test_add_grouped_rejects_unknown_columns(options):
+    table = Sheet(name="Students").get_and_add_table(table_name="Records")
+    table.get_and_add_column("Name").get_and_add_cell("Name")
+
+    with pytest.raises(ValueError):
+        table.add_grouped([{"Name": "Alice"}], group_by="Name", **options)
+    assert len(table.get_column("Name").cells) == 1
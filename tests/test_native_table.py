@@ -0,0 +1,71 @@
+import re
+import zipfile
+
+import pytest
+
+from excel_writer import ExcelWriter, Sheet, Line
+
+
+def make_sheet(name: str = "Data", table_name: str = "Scores") -> Sheet:
+    sheet = Sheet(name=name)
+    table = sheet.get_and_add_table(table_name=table_name, draw_from=(0, 0), table_style="Table Style Medium 9")
+    name = table.get_and_add_column("Name")
+    score = table.get_and_add_column("Score", total_function="sum")
+    name.get_and_add_cell("Name")
+    score.get_and_add_cell("Score")
+    for i, value in enumerate([1, 2, 3]):
+        name.get_and_add_cell(f"n{i}")
+        score.get_and_add_cell(value)
+    table.draw_division(Line.THICK)
+
+    return sheet
+
+
+def test_native_table_with_totals_row(tmp_path):
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, [make_sheet()]).write_excel_sheets()
+
+    with zipfile.ZipFile(filename) as xlsx_file:
+        sheet_xml = xlsx_file.read("xl/worksheets/sheet1.xml").decode()
+        table_xml = xlsx_file.read("xl/tables/table1.xml").decode()
+
+    assert 'ref="A1:B5"' in table_xml and 'totalsRowFunction="sum"' in table_xml
+    # The summed column holds numbers, not shared strings, and the totals row adds them up.
+    assert re.findall(r'<c r="B[234]"[^>]*><v>([^<]*)</v>', sheet_xml) == ["1", "2", "3"]
+    assert "SUBTOTAL(109,[Score])" in sheet_xml
+    assert re.search(r'<c r="A2"[^>]* t="s">', sheet_xml)
+
+
+def test_native_table_rejects_merged_cells(tmp_path):
+    sheet = make_sheet()
+    column = sheet.get_table("Scores").get_column("Name")
+    sheet.merge([column.cells[1], column.cells[2]])
+
+    with pytest.raises(ValueError):
+        ExcelWriter(str(tmp_path / "output.xlsx"), [sheet]).write_excel_sheets()
+
+
+def test_native_table_names_are_valid_and_unique(tmp_path):
+    sheets = [make_sheet("2024", "2024 Records"), make_sheet("A", "Records"), make_sheet("B", "records"),
+              make_sheet("C", "A1")]
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, sheets).write_excel_sheets()
+
+    with zipfile.ZipFile(filename) as xlsx_file:
+        names = [
+            re.search(r' name="([^"]*)"', xlsx_file.read(f"xl/tables/table{i}.xml").decode()).group(1)
+            for i in range(1, 5)
+        ]
+        sheet_xml = xlsx_file.read("xl/worksheets/sheet1.xml").decode()
+    assert names == ["_2024_Records", "Records", "records_2", "_A1"]
+    assert re.findall(r'<c r="B[234]"[^>]*><v>([^<]*)</v>', sheet_xml) == ["1", "2", "3"]
+
+
+def test_native_table_that_can_not_be_added_fails(tmp_path):
+    sheet = make_sheet()
+    # The header fits on the last row of the sheet, its empty data row does not.
+    table = sheet.get_and_add_table(table_name="Last", draw_from=(1048575, 0), table_style="Table Style Medium 9")
+    table.get_and_add_column("Value").get_and_add_cell("Value")
+
+    with pytest.raises(ValueError):
+        ExcelWriter(str(tmp_path / "output.xlsx"), [sheet]).write_excel_sheets()
@@ -0,0 +1,51 @@
+import zipfile
+
+import pytest
+
+from excel_writer import ExcelWriter, Sheet, packager
+
+
+def make_sheet() -> Sheet:
+    sheet = Sheet(name="Data")
+    table = sheet.get_and_add_table(table_name="Records", draw_from=(0, 0))
+    column = table.get_and_add_column("Value")
+    column.get_and_add_cell("Value")
+    for i in range(100):
+        column.get_and_add_cell(i)
+
+    return sheet
+
+
+@pytest.mark.parametrize("compression_level", [0, 1, 6, 9])
+def test_packaged_workbook_is_valid_zip(tmp_path, compression_level):
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, [make_sheet()], compression_level=compression_level, max_workers=2).write_excel_sheets()
+
+    with zipfile.ZipFile(filename) as xlsx_file:
+        assert xlsx_file.testzip() is None
+        assert "xl/worksheets/sheet1.xml" in xlsx_file.namelist()
+        expected = zipfile.ZIP_DEFLATED if compression_level else zipfile.ZIP_STORED
+        assert all(info.compress_type == expected for info in xlsx_file.infolist())
+
+
+@pytest.mark.parametrize("compression_level", [-1, 10, 1.5])
+def test_invalid_compression_level_fails_early(tmp_path, compression_level):
+    with pytest.raises(ValueError):
+        ExcelWriter(str(tmp_path / "output.xlsx"), [make_sheet()], compression_level=compression_level)
+
+
+@pytest.mark.parametrize("compression_level", [0, 6])
+def test_zip64_and_chunked_parts_hold_the_same_content(tmp_path, monkeypatch, compression_level):
+    monkeypatch.setattr(packager, "CHUNK_SIZE", 64)
+    contents = []
+    for zip32_limit in [packager.ZIP32_LIMIT, 1]:
+        monkeypatch.setattr(packager, "ZIP32_LIMIT", zip32_limit)
+        filename = str(tmp_path / f"output_{zip32_limit}.xlsx")
+        ExcelWriter(filename, [make_sheet()], compression_level=compression_level, max_workers=2).write_excel_sheets()
+
+        with zipfile.ZipFile(filename) as xlsx_file:
+            assert xlsx_file.testzip() is None
+            contents.append({info.filename: xlsx_file.read(info) for info in xlsx_file.infolist()})
+
+    assert contents[0].keys() == contents[1].keys()
+    assert all(contents[0][name] == contents[1][name] for name in contents[0] if name != "docProps/core.xml")
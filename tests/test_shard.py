@@ -0,0 +1,83 @@
+import pickle
+import re
+import zipfile
+
+import pytest
+
+from excel_writer import ExcelWriter, Sheet
+
+
+def make_sheet(name: str, n_rows: int, max_rows: int = None, **table_options) -> Sheet:
+    sheet = Sheet(name=name)
+    table = sheet.get_and_add_table(table_name="Records", draw_from=(0, 0), max_rows=max_rows, **table_options)
+    column = table.get_and_add_column("Name")
+    column.get_and_add_cell("Name")
+    for i in range(n_rows):
+        column.get_and_add_cell(f"Student {i}")
+
+    return sheet
+
+
+def test_shard_moves_the_cells():
+    sheet = make_sheet("Data", 5, max_rows=2)
+    table = sheet.get_table("Records")
+    cells = list(table.get_column("Name").cells)
+
+    shards = table.shard()
+
+    assert [shard.shard_range for shard in shards] == [(0, 2), (2, 4), (4, 5)]
+    assert len(table.get_column("Name").cells) == 0
+    assert shards[1].get_column("Name").cells[1] is cells[3]
+    assert [cell.x for cell in shards[1].get_column("Name").cells] == [0, 1, 2]
+
+
+def test_continuation_sheets_skip_taken_names(tmp_path):
+    sheets = [make_sheet("Data", 5, max_rows=2), make_sheet("Data (2)", 1)]
+
+    filename = str(tmp_path / "output.xlsx")
+    manifest = ExcelWriter(filename, sheets).write_excel_sheets()
+
+    assert [entry["sheet"] for entry in manifest] == ["Data", "Data (3)", "Data (4)", "Data (2)"]
+    with zipfile.ZipFile(filename) as xlsx_file:
+        workbook = xlsx_file.read("xl/workbook.xml").decode()
+    assert re.findall(r'<sheet name="([^"]*)"', workbook) == ["Data", "Data (3)", "Data (4)", "Data (2)"]
+
+
+def test_workbooks_rendered_by_a_bounded_number_of_processes(tmp_path):
+    sheet = make_sheet("Data", 9, max_rows=2, memory_budget=2, tmpdir=str(tmp_path))
+
+    filename = str(tmp_path / "output.xlsx")
+    manifest = ExcelWriter(filename, [sheet], sheets_per_workbook=1, max_processes=1).write_excel_sheets()
+
+    assert [(entry["filename"], entry["rows"]) for entry in manifest] == [
+        (filename, (0, 2)),
+        (str(tmp_path / "output_2.xlsx"), (2, 4)),
+        (str(tmp_path / "output_3.xlsx"), (4, 6)),
+        (str(tmp_path / "output_4.xlsx"), (6, 8)),
+        (str(tmp_path / "output_5.xlsx"), (8, 9)),
+    ]
+    with zipfile.ZipFile(str(tmp_path / "output_4.xlsx")) as xlsx_file:
+        shared_strings = xlsx_file.read("xl/sharedStrings.xml").decode()
+    assert re.findall(r"<t>([^<]*)</t>", shared_strings) == ["Name", "Student 6", "Student 7"]
+    # The spilled cells are released once every workbook is written.
+    assert not [name for name in tmp_path.iterdir() if name.suffix == ".spill"]
+
+
+def test_sharded_sheet_can_not_be_written_twice(tmp_path):
+    sheet = make_sheet("Data", 5, max_rows=2)
+    ExcelWriter(str(tmp_path / "output.xlsx"), [sheet]).write_excel_sheets()
+
+    with pytest.raises(ValueError):
+        ExcelWriter(str(tmp_path / "again.xlsx"), [sheet]).write_excel_sheets()
+
+
+def test_pickled_continuation_sheet_carries_only_its_strings():
+    sheet = Sheet(name="Data")
+    column = sheet.get_and_add_table(table_name="Records", max_rows=10).get_and_add_column("Name", intern_strings=True)
+    for i in range(100):
+        column.get_and_add_cell(f"Student {i}")
+
+    continuation = sheet.shard()[1]
+    data = pickle.dumps(continuation)
+    assert b"Student 15" in data and b"Student 5" not in data
+    assert len(pickle.loads(data).string_pool) == 0
@@ -0,0 +1,70 @@
+import os
+import pickle
+
+import pytest
+
+from excel_writer import ExcelWriter, Sheet, SpillStore, Cell
+
+
+def test_spilled_cells_are_read_back_in_order(tmp_path):
+    store = SpillStore(memory_budget=2, tmpdir=str(tmp_path))
+    for i in range(7):
+        store.append(Cell(i, i, 0))
+
+    assert store.file is not None
+    assert [cell.data for cell in store] == [str(i) for i in range(7)]
+    assert store[-1].data == "6" and [cell.data for cell in store[1:3]] == ["1", "2"]
+
+    cell = store[0]
+    cell.data = "changed"
+    store[0] = cell
+    assert store[0].data == "changed"
+    store.close()
+
+
+def test_spill_stores_are_closed_once_their_table_is_written(tmp_path):
+    sheet = Sheet(name="Students")
+    table = sheet.get_and_add_table(table_name="Records", draw_from=(0, 0), memory_budget=2, tmpdir=str(tmp_path))
+    column = table.get_and_add_column("Name")
+    for i in range(10):
+        column.get_and_add_cell(f"Student {i}")
+    assert column.cells.file is not None
+
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, [sheet]).write_excel_sheets()
+
+    assert column.cells.file is None and column.cells.map is None
+    assert len(column.cells) == 10
+    with pytest.raises(ValueError):
+        column.cells[0]
+
+
+def test_pickled_store_refers_to_the_spilled_cells(tmp_path):
+    store = SpillStore(memory_budget=2, tmpdir=str(tmp_path))
+    for i in range(1000):
+        store.append(Cell(f"Student {i}", i, 0))
+
+    copy = pickle.loads(pickle.dumps(store))
+    assert b"Student 5" not in pickle.dumps(store)
+    assert [cell.data for cell in copy] == [cell.data for cell in store]
+
+    # The copy writes its own cells to a file of its own.
+    copy[0] = Cell("changed", 0, 0)
+    assert copy[0].data == "changed" and store[0].data == "Student 0"
+    copy.close()
+    assert store[1].data == "Student 1"
+
+    path = store.path
+    store.close()
+    assert not os.path.exists(path)
+
+
+def test_spilled_columns_do_not_intern_their_strings(tmp_path):
+    sheet = Sheet(name="Students")
+    table = sheet.get_and_add_table(table_name="Records", memory_budget=2, tmpdir=str(tmp_path))
+    column = table.get_and_add_column("ID", intern_strings=True)
+    for i in range(10):
+        column.get_and_add_cell(f"ID {i}")
+
+    assert len(sheet.string_pool) == 0
+    column.cells.close()
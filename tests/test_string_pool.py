@@ -0,0 +1,72 @@
+import re
+import zipfile
+
+from excel_writer import ExcelWriter, Sheet, StringPool
+
+
+def read_shared_strings(filename: str) -> list:
+    with zipfile.ZipFile(filename) as xlsx_file:
+        if "xl/sharedStrings.xml" not in xlsx_file.namelist():
+            return []
+        xml = xlsx_file.read("xl/sharedStrings.xml").decode()
+
+    return re.findall(r"<si><t[^>]*>([^<]*)</t></si>", xml)
+
+
+def test_empty_pool_is_shared_and_interns_equal_strings():
+    string_pool = StringPool()
+    sheet = Sheet(name="Students", string_pool=string_pool)
+    table = sheet.get_and_add_table(table_name="Scores", draw_from=(0, 0))
+    assert table.string_pool is string_pool
+
+    name_col = table.get_and_add_column("Name", intern_strings=True)
+    subject_col = table.get_and_add_column("Subject", intern_strings=True)
+    id_col = table.get_and_add_column("ID")
+    assert name_col.string_pool is string_pool and subject_col.string_pool is string_pool
+
+    name_cell = name_col.get_and_add_cell("".join(["Ma", "ths"]))
+    subject_cell = subject_col.get_and_add_cell("".join(["Mat", "hs"]))
+    assert name_cell.data is subject_cell.data
+    # Interning is opt-in, the values of the other columns are kept as they are.
+    id_col.get_and_add_cell("".join(["Ma", "ths"]))
+    assert len(string_pool) == 1
+
+
+def test_shared_strings_hold_only_the_written_strings(tmp_path):
+    string_pool = StringPool()
+    string_pool.intern("Unused")
+    sheet = Sheet(name="Students", string_pool=string_pool)
+    table = sheet.get_and_add_table(table_name="Scores", draw_from=(0, 0))
+    name_col = table.get_and_add_column("Name", intern_strings=True)
+    score_col = table.get_and_add_column("Score")
+    table.add_chart("column", ["Score"], "D2", categories="Name")
+    for name, score in [("Name", "Score"), ("Alice", 90), ("Bob", 85), ("Alice", 70)]:
+        name_col.get_and_add_cell(name)
+        score_col.get_and_add_cell(score)
+    sheet.insert_cell("Rich source", (5, 0), data_format={"(0, 4)": {"bold": True}})
+    sheet.insert_cell("=1+1", (6, 0))
+    sheet.insert_cell("https://example.com", (7, 0))
+
+    filename = str(tmp_path / "output.xlsx")
+    ExcelWriter(filename, [sheet]).write_excel_sheets()
+
+    shared_strings = read_shared_strings(filename)
+    # Unused pool strings, numbers, formulas and rich source strings stay out.
+    assert shared_strings == ["Name", "Alice", "Bob", "Score", "https://example.com"]
+
+
+def test_sharded_workbooks_only_carry_their_own_strings(tmp_path):
+    sheet = Sheet(name="Students")
+    table = sheet.get_and_add_table(table_name="Records", draw_from=(0, 0), max_rows=2)
+    column = table.get_and_add_column("Name")
+    for name in ["Name", "Alice", "Bob", "Carol", "Dave"]:
+        column.get_and_add_cell(name)
+
+    filename = str(tmp_path / "output.xlsx")
+    manifest = ExcelWriter(filename, [sheet], sheets_per_workbook=1).write_excel_sheets()
+
+    filenames = sorted({entry["filename"] for entry in manifest})
+    assert [read_shared_strings(filename) for filename in filenames] == [
+        ["Name", "Alice", "Bob"],
+        ["Name", "Carol", "Dave"],
+    ]